@@ -138,6 +138,23 @@ def run_self_test() -> int:
         )
         return 1
 
+    # Characters whose lowercase form differs from their case-fold must not break routing
+    gemini_agent_3, _ = detect_agent("İmage upload, then research it")
+    if gemini_agent_3 != "gemini":
+        print("Self-test failed: 'İmage ... research' should route to gemini", file=sys.stderr)
+        return 1
+
+    # Adjacent triggers must both be seen, not consumed by the first match
+    gemini_agent_4, _ = detect_agent("compareresearch")
+    if gemini_agent_4 != "gemini":
+        print("Self-test failed: 'compareresearch' should route to gemini", file=sys.stderr)
+        return 1
+
+    unmatched_agent, _ = detect_agent("teſt the parser")
+    if unmatched_agent is not None:
+        print("Self-test failed: 'teſt' should not match any trigger", file=sys.stderr)
+        return 1
+
     return 0
 
 
@@ -148,7 +165,8 @@ def main():
 
         validate_trigger_configuration()
 
-        data = json.load(sys.stdin)
+        # Parse raw bytes: skips the text-decoding layer and is locale-independent
+        data = json.loads(sys.stdin.buffer.read())
         prompt = data.get("prompt", "")
 
         # Skip truly empty/single-char prompts (Japanese triggers can be 3-4 chars)
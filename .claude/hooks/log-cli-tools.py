@@ -8,64 +8,101 @@ Logs are stored in .claude/logs/cli-tools.jsonl
 All agents (Claude Code, subagents, Codex, Gemini) can read this log.
 """
 
+import functools
 import json
 import os
 import re
 import sys
 from datetime import datetime, timezone
-from pathlib import Path
 
-LOG_DIR = Path(__file__).parent.parent / "logs"
-LOG_FILE = LOG_DIR / "cli-tools.jsonl"
+# Plain os.path strings: cheaper than Path arithmetic on every hook start
+# _ORCHESTRA_LOG_DIR_OVERRIDE redirects logging (used by the test suite)
+LOG_DIR = os.environ.get("_ORCHESTRA_LOG_DIR_OVERRIDE") or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "logs"
+)
+LOG_FILE = os.path.join(LOG_DIR, "cli-tools.jsonl")
 SENSITIVE_PATTERNS = [
-    re.compile(r"\bsk-[A-Za-z0-9_-]{10,}\b"),
-    re.compile(r"\bAIza[0-9A-Za-z_-]{20,}\b"),
-    re.compile(r"\bghp_[A-Za-z0-9]{20,}\b"),
-    re.compile(r"\bAKIA[0-9A-Z]{16}\b"),
-    re.compile(r"\bxox[bpras]-[A-Za-z0-9\-]+\b"),
-    re.compile(r"\beyJ[A-Za-z0-9_-]{10,}\.[A-Za-z0-9_-]{10,}"),
-    re.compile(r"Bearer\s+[A-Za-z0-9\-._~+/]{20,}"),
-    re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b"),
+    r"\bsk-[A-Za-z0-9_-]{10,}\b",
+    r"\bAIza[0-9A-Za-z_-]{20,}\b",
+    r"\bghp_[A-Za-z0-9]{20,}\b",
+    r"\bAKIA[0-9A-Z]{16}\b",
+    r"\bxox[bpras]-[A-Za-z0-9\-]+\b",
+    r"\beyJ[A-Za-z0-9_-]{10,}\.[A-Za-z0-9_-]{10,}",
+    r"Bearer\s+[A-Za-z0-9\-._~+/]{20,}",
+    r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b",
 ]
+# Literal each SENSITIVE_PATTERNS match must contain, in the same order (cheap prefilter)
+SENSITIVE_MARKERS = ("sk-", "AIza", "ghp_", "AKIA", "xox", "eyJ", "Bearer", "@")
+
+
+@functools.cache
+def sensitive_regexes() -> tuple[re.Pattern[str], ...]:
+    """Compile SENSITIVE_PATTERNS on first use.
+
+    Most Bash events are not Codex/Gemini calls and never redact anything,
+    so only hook runs that actually write a log entry pay for the compile.
+    """
+    return tuple(re.compile(pattern) for pattern in SENSITIVE_PATTERNS)
 
 
 def redact_sensitive(text: str) -> str:
-    """Mask known sensitive token patterns in logs."""
-    redacted = text
-    for pattern in SENSITIVE_PATTERNS:
-        redacted = pattern.sub("[REDACTED]", redacted)
-    return redacted
+    """Mask known sensitive token patterns in logs.
 
+    Patterns are applied one after another, in order, rather than as a single
+    alternation: a leftmost match of a broad pattern (the email one) could
+    otherwise swallow the prefix of an adjacent token and leave its body in
+    clear. A pattern whose marker is absent from the text is skipped.
+    """
+    if not any(marker in text for marker in SENSITIVE_MARKERS):
+        return text
+    for marker, pattern in zip(SENSITIVE_MARKERS, sensitive_regexes(), strict=True):
+        if marker in text:
+            text = pattern.sub("[REDACTED]", text)
+    return text
 
-def extract_quoted_string(command: str, prefix_pattern: str) -> str | None:
+
+# Double-quoted, single-quoted, or $'...' argument; exactly one group matches
+QUOTED_ARGUMENT = (
+    r"""\s+(?:"((?:[^"\\]|\\.)*)"|'((?:[^'\\]|\\.)*)'|\$'((?:[^'\\]|\\.)*)')"""
+)
+
+
+@functools.cache
+def quoted_argument_regex(prefix_pattern: str) -> re.Pattern[str]:
+    """Compile *prefix_pattern* followed by a quoted argument, once per prefix."""
+    return re.compile(prefix_pattern + QUOTED_ARGUMENT, re.DOTALL)
+
+
+def extract_quoted_string(command: str, prefix_pattern: str, start: int = 0) -> str | None:
     """Extract a quoted string following a prefix pattern.
 
-    Handles double quotes, single quotes, and $'...' syntax.
-    Tolerates trailing redirects like 2>> file.
+    Handles double quotes, single quotes, and $'...' syntax in a single
+    search beginning at *start*. Tolerates trailing redirects like 2>> file.
     """
-    patterns = [
-        prefix_pattern + r'''\s+"((?:[^"\\]|\\.)*)"''',
-        prefix_pattern + r"""\s+'((?:[^'\\]|\\.)*)'""",
-        prefix_pattern + r"""\s+\$'((?:[^'\\]|\\.)*)'""",
-    ]
-    for pat in patterns:
-        match = re.search(pat, command, re.DOTALL)
-        if match:
-            return match.group(1).strip()
-    return None
+    match = quoted_argument_regex(prefix_pattern).search(command, start)
+    if not match:
+        return None
+    return next(group for group in match.groups() if group is not None).strip()
 
 
 def extract_codex_prompt(command: str) -> str | None:
     """Extract prompt from codex exec command."""
-    result = extract_quoted_string(command, r"codex\s+exec\s+.*?--full-auto")
+    # The prefixes begin with a literal "codex": skip straight to it with str.find
+    start = command.find("codex")
+    if start == -1:
+        return None
+    result = extract_quoted_string(command, r"codex\s+exec\s+.*?--full-auto", start)
     if result:
         return result
-    return extract_quoted_string(command, r"codex\s+exec\s+\S+")
+    return extract_quoted_string(command, r"codex\s+exec\s+\S+", start)
 
 
 def extract_gemini_prompt(command: str) -> str | None:
     """Extract prompt from gemini command."""
-    return extract_quoted_string(command, r"gemini\b.*?-p")
+    start = command.find("gemini")
+    if start == -1:
+        return None
+    return extract_quoted_string(command, r"gemini\b.*?-p", start)
 
 
 def extract_model(command: str) -> str | None:
@@ -74,56 +111,100 @@ def extract_model(command: str) -> str | None:
     return match.group(1) if match else None
 
 
-COMMAND_SEGMENT_TOOL_PATTERN = re.compile(
-    r"(?:^|[;&|]\s*|\&\&\s*|\|\|\s*)(codex|gemini)\b",
-    re.IGNORECASE,
-)
+COMMAND_SEPARATORS = ";&|"
+INVOKABLE_TOOLS = ("codex", "gemini")  # In preference order
+
+
+def find_tool_segment(command_lower: str, tool: str) -> int:
+    """Return the index where *tool* starts a command segment, or -1.
+
+    Candidates are located with str.find and only then checked for a word
+    boundary after the name and a separator (or start of command) before it.
+    """
+    index = command_lower.find(tool)
+    while index != -1:
+        end = index + len(tool)
+        if end == len(command_lower) or not (
+            command_lower[end].isalnum() or command_lower[end] == "_"
+        ):
+            before = index - 1
+            while before >= 0 and command_lower[before].isspace():
+                before -= 1
+            if index == 0 or (before >= 0 and command_lower[before] in COMMAND_SEPARATORS):
+                return index
+        index = command_lower.find(tool, index + 1)
+    return -1
 
 
 def detect_invoked_tool(command: str) -> str | None:
     """Detect invoked CLI tool from command segments."""
-    detected_tools = [
-        match.group(1).lower() for match in COMMAND_SEGMENT_TOOL_PATTERN.finditer(command)
-    ]
-    if "codex" in detected_tools:
-        return "codex"
-    if "gemini" in detected_tools:
-        return "gemini"
+    command_lower = command.lower()
+    for tool in INVOKABLE_TOOLS:
+        if find_tool_segment(command_lower, tool) != -1:
+            return tool
     return None
 
 
+# Extra characters redacted past the cut so a secret straddling it still matches
+REDACTION_MARGIN = 256
+
+
 def truncate_text(text: str, max_length: int = 2000) -> str:
-    """Truncate text if too long."""
-    text = redact_sensitive(text)
+    """Redact and truncate text if too long.
+
+    Only the retained prefix (plus REDACTION_MARGIN) is redacted, so large
+    outputs are not scanned in full just to be thrown away. The last
+    REDACTION_MARGIN characters of the redacted slice are never kept: a
+    secret cut off at the slice boundary may not match its pattern there.
+    """
     if len(text) <= max_length:
-        return text
-    return text[:max_length] + f"... [truncated, {len(text)} total chars]"
+        return redact_sensitive(text)
+    head = redact_sensitive(text[: max_length + REDACTION_MARGIN])
+    head = head[: min(max_length, len(head) - REDACTION_MARGIN)]
+    return head + f"... [truncated, {len(text)} total chars]"
 
 
 MAX_LOG_SIZE = 5 * 1024 * 1024
+LOG_OPEN_FLAGS = os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0)
 
 
-def rotate_log_if_needed() -> None:
-    """Rotate log file if it exceeds MAX_LOG_SIZE (5 MB)."""
-    if not LOG_FILE.exists():
-        return
+def open_log_fd() -> int:
+    """Open the log for appending, creating LOG_DIR only when it is missing."""
     try:
-        if LOG_FILE.stat().st_size < MAX_LOG_SIZE:
-            return
+        return os.open(LOG_FILE, LOG_OPEN_FLAGS, 0o644)
+    except FileNotFoundError:
+        os.makedirs(LOG_DIR, exist_ok=True)
+        return os.open(LOG_FILE, LOG_OPEN_FLAGS, 0o644)
+
+
+def rotate_log_if_needed(fd: int) -> int:
+    """Rotate the log once it reaches MAX_LOG_SIZE (5 MB); return the fd to append to.
+
+    The size comes from fstat on the already-open descriptor. On rotation it
+    is closed and a fresh log opened, so the new entry starts the new file.
+    """
+    if os.fstat(fd).st_size < MAX_LOG_SIZE:
+        return fd
+    os.close(fd)
+    try:
+        os.replace(LOG_FILE, LOG_FILE + ".1")
     except OSError:
-        return
-    rotated = LOG_FILE.with_suffix(".jsonl.1")
-    if rotated.exists():
-        rotated.unlink()
-    LOG_FILE.rename(rotated)
+        pass
+    return open_log_fd()
 
 
 def log_entry(entry: dict) -> None:
-    """Append entry to JSONL log file."""
-    LOG_DIR.mkdir(parents=True, exist_ok=True)
-    rotate_log_if_needed()
-    with open(LOG_FILE, "a", encoding="utf-8") as f:
-        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    """Append entry to JSONL log file.
+
+    A single unbuffered O_APPEND write, made after any rotation so the entry
+    always lands in the live log that checkpoint.py reads.
+    """
+    payload = (json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8")
+    fd = rotate_log_if_needed(open_log_fd())
+    try:
+        os.write(fd, payload)
+    finally:
+        os.close(fd)
 
 
 def parse_tool_response(hook_input: dict) -> tuple[str, str, int]:
@@ -180,10 +261,10 @@ def maybe_emit_notification(tool: str, exit_code: int) -> None:
 
 
 def main() -> None:
-    # Read hook input from stdin
+    # Read hook input from stdin as raw bytes (json detects UTF-8 itself)
     try:
-        hook_input = json.load(sys.stdin)
-    except json.JSONDecodeError:
+        hook_input = json.loads(sys.stdin.buffer.read())
+    except ValueError:
         return
 
     # Only process Bash tool calls
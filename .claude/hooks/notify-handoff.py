@@ -7,37 +7,45 @@ loading it via `/handoff --resume`.
 """
 
 import json
+import os
 import sys
-from pathlib import Path
 
-HANDOFFS_DIR = Path(__file__).parent.parent / "handoffs"
+# _ORCHESTRA_HANDOFFS_DIR_OVERRIDE points the hook elsewhere (used by the test suite)
+HANDOFFS_DIR = os.environ.get("_ORCHESTRA_HANDOFFS_DIR_OVERRIDE") or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "handoffs"
+)
 
 
-def find_latest_prompt() -> Path | None:
-    """Find the most recent .prompt.md file in the handoffs directory."""
-    if not HANDOFFS_DIR.is_dir():
+def find_latest_prompt() -> str | None:
+    """Find the most recent .prompt.md file in the handoffs directory.
+
+    Handoff names are UTC timestamps, so the lexicographic max is the latest.
+    """
+    try:
+        with os.scandir(HANDOFFS_DIR) as entries:
+            latest = max(
+                (entry.name for entry in entries if entry.name.endswith(".prompt.md")),
+                default=None,
+            )
+    except OSError:
         return None
-    prompts = sorted(HANDOFFS_DIR.glob("*.prompt.md"), reverse=True)
-    return prompts[0] if prompts else None
+    return os.path.join(HANDOFFS_DIR, latest) if latest else None
 
 
 def main() -> None:
-    try:
-        json.load(sys.stdin)
-    except (json.JSONDecodeError, ValueError):
-        pass
+    # The payload carries nothing this hook needs; drain stdin without parsing it
+    sys.stdin.buffer.read()
 
     latest = find_latest_prompt()
     if not latest:
         sys.exit(0)
 
-    handoff_name = latest.stem.replace(".prompt", "")
     output = {
         "hookSpecificOutput": {
             "hookEventName": "SessionStart",
             "additionalContext": (
                 f"[Handoff] 前セッションのハンドオフがあります: "
-                f"`.claude/handoffs/{latest.name}`\n"
+                f"`.claude/handoffs/{os.path.basename(latest)}`\n"
                 f"読み込むには `/handoff --resume` を実行してください。\n"
                 f"一覧を見るには `/handoff --list` を実行してください。"
             ),
@@ -7,7 +7,6 @@ on Windows requires Git Bash.
 """
 
 import json
-import platform
 import sys
 
 # High-confidence PowerShell-specific patterns (unlikely to appear in bash)
@@ -43,12 +42,12 @@ def detect_powershell_syntax(command: str) -> str | None:
 
 
 def main():
-    # Only check on Windows
-    if platform.system() != "Windows":
+    # Only check on Windows (sys.platform is a constant; platform.system() is not)
+    if sys.platform != "win32":
         sys.exit(0)
 
     try:
-        data = json.load(sys.stdin)
+        data = json.loads(sys.stdin.buffer.read())
         tool_input = data.get("tool_input", {})
         command = tool_input.get("command", "")
 
@@ -7,9 +7,11 @@ when the ending session appears to involve planning/implementation work.
 """
 
 import json
+import os
 import re
 import subprocess
 import sys
+from collections.abc import Iterator
 from pathlib import Path
 
 
@@ -34,36 +36,65 @@ HANDOFF_SIGNALS = [
     r"修正",
 ]
 
+REGEX_METACHARACTERS = frozenset(".^$*+?{}[]\\|()")
 
-def serialize_payload_for_match(payload: dict) -> str:
-    """Serialize hook payload into searchable lowercase text."""
-    try:
-        return json.dumps(payload, ensure_ascii=False).lower()
-    except Exception:
-        return ""
 
+def split_signals(signals: list[str]) -> tuple[tuple[str, ...], re.Pattern[str] | None]:
+    """Split signals into lowercase literals and one alternation for the rest.
 
-def matches_any_signal(text: str, patterns: list[str]) -> bool:
-    """Return True if any regex pattern matches the text."""
-    return any(re.search(pattern, text, re.IGNORECASE) for pattern in patterns)
+    Literal signals are checked with plain substring search; only signals that
+    actually use regex syntax go through the regex engine.
+    """
+    literals = tuple(s.lower() for s in signals if REGEX_METACHARACTERS.isdisjoint(s))
+    patterns = [s for s in signals if not REGEX_METACHARACTERS.isdisjoint(s)]
+    pattern = re.compile("|".join(patterns), re.IGNORECASE) if patterns else None
+    return literals, pattern
 
 
-def session_mentions_plan(payload: dict) -> bool:
-    """Best-effort detection of planning-related session content."""
-    text = serialize_payload_for_match(payload)
-    if not text:
-        return False
+PLAN_LITERALS, PLAN_RE = split_signals(PLAN_SIGNALS)
+HANDOFF_LITERALS, HANDOFF_RE = split_signals(HANDOFF_SIGNALS)
 
-    return matches_any_signal(text, PLAN_SIGNALS)
 
+def iter_payload_strings(value: object) -> Iterator[str]:
+    """Yield every string (keys and values) nested in a hook payload."""
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            if isinstance(key, str):
+                yield key
+            yield from iter_payload_strings(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from iter_payload_strings(item)
 
-def session_mentions_handoff(payload: dict) -> bool:
-    """Best-effort detection of handoff-related session content."""
-    text = serialize_payload_for_match(payload)
-    if not text:
-        return False
 
-    return matches_any_signal(text, HANDOFF_SIGNALS)
+def matches_any_signal(
+    text: str, literals: tuple[str, ...], pattern: re.Pattern[str] | None
+) -> bool:
+    """Return True if the lowercased text contains a literal or matches the pattern."""
+    if any(literal in text for literal in literals):
+        return True
+    return pattern is not None and pattern.search(text) is not None
+
+
+def collect_payload_text(payload: object) -> str:
+    """Join the payload's strings into one lowercased text, built once per run.
+
+    Strings are newline-separated; no signal contains a newline, so a match
+    cannot straddle two payload strings.
+    """
+    return "\n".join(iter_payload_strings(payload)).lower()
+
+
+def session_mentions_plan(text: str) -> bool:
+    """Best-effort detection of planning-related session content."""
+    return matches_any_signal(text, PLAN_LITERALS, PLAN_RE)
+
+
+def session_mentions_handoff(text: str) -> bool:
+    """Best-effort detection of handoff-related session content."""
+    return matches_any_signal(text, HANDOFF_LITERALS, HANDOFF_RE)
 
 
 def resolve_repo_root() -> Path:
@@ -72,18 +103,31 @@ def resolve_repo_root() -> Path:
 
 
 def count_working_tree_changes(repo_root: Path) -> int:
-    """Get current git working tree change count."""
+    """Get current git working tree change count (tracked files only).
+
+    Skips the untracked-file walk and optional index lock refresh, which
+    dominate `git status` time on large trees; the short timeout keeps a
+    slow repository from delaying session end.
+    """
     try:
         result = subprocess.run(
-            ["git", "status", "--porcelain"],
+            [
+                "git",
+                "--no-optional-locks",
+                "status",
+                "--porcelain=v1",
+                "--untracked-files=no",
+            ],
             cwd=repo_root,
             capture_output=True,
-            text=True,
-            timeout=3,
+            stdin=subprocess.DEVNULL,
+            timeout=1,
         )
         if result.returncode != 0:
             return 0
-        return len([line for line in result.stdout.splitlines() if line.strip()])
+        # Porcelain v1 prints exactly one newline-terminated line per entry;
+        # counting raw bytes avoids decoding output that is never displayed
+        return result.stdout.count(b"\n")
     except Exception:
         return 0
 
@@ -94,20 +138,26 @@ def plan_md_exists(repo_root: Path) -> bool:
 
 
 def find_latest_handoff_file(repo_root: Path) -> Path | None:
-    """Get the latest generated handoff markdown file."""
-    handoffs_dir = repo_root / ".claude" / "handoffs"
-    if not handoffs_dir.exists():
-        return None
+    """Get the latest generated handoff markdown file.
 
-    candidates = [
-        path
-        for path in handoffs_dir.glob("*.md")
-        if not path.name.endswith(".prompt.md")
-    ]
-    if not candidates:
+    One os.scandir pass; only matching entries are stat'ed and a Path is
+    built for the winner alone.
+    """
+    latest_path: str | None = None
+    latest_mtime = -1.0
+    try:
+        with os.scandir(repo_root / ".claude" / "handoffs") as entries:
+            for entry in entries:
+                name = entry.name
+                if not name.endswith(".md") or name.endswith(".prompt.md"):
+                    continue
+                mtime = entry.stat().st_mtime
+                if mtime > latest_mtime:
+                    latest_mtime, latest_path = mtime, entry.path
+    except OSError:
         return None
 
-    return max(candidates, key=lambda path: path.stat().st_mtime)
+    return Path(latest_path) if latest_path else None
 
 
 def should_emit_session_end_reminder(
@@ -165,11 +215,12 @@ def build_reminder_parts(
 
 def main() -> None:
     try:
-        payload = json.load(sys.stdin)
+        payload = json.loads(sys.stdin.buffer.read())
         repo_root = resolve_repo_root()
 
-        plan_related = session_mentions_plan(payload)
-        handoff_related = session_mentions_handoff(payload)
+        payload_text = collect_payload_text(payload)
+        plan_related = session_mentions_plan(payload_text)
+        handoff_related = session_mentions_handoff(payload_text)
         change_count = count_working_tree_changes(repo_root)
 
         if not should_emit_session_end_reminder(
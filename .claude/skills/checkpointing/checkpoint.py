@@ -28,86 +28,175 @@ Handoff Mode (--handoff):
     - Resume prompt template for a new session
 """
 
-import argparse
+import heapq
+import io
 import json
-import re
-import subprocess
+from collections import defaultdict
+from collections.abc import Callable, Iterable
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Any, TextIO
 
 
 PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
-LOG_FILE = PROJECT_ROOT / ".claude" / "logs" / "cli-tools.jsonl"
+# Plain-string paths for the files read and written on every run.
+LOG_FILE = str(PROJECT_ROOT / ".claude" / "logs" / "cli-tools.jsonl")
 CHECKPOINTS_DIR = PROJECT_ROOT / ".claude" / "checkpoints"
 HANDOFFS_DIR = PROJECT_ROOT / ".claude" / "handoffs"
 DESIGN_FILE = PROJECT_ROOT / ".claude" / "docs" / "DESIGN.md"
 
 CONTEXT_FILES = {
-    "claude": PROJECT_ROOT / "CLAUDE.md",
-    "codex": PROJECT_ROOT / ".codex" / "AGENTS.md",
-    "gemini": PROJECT_ROOT / ".gemini" / "GEMINI.md",
+    "claude": str(PROJECT_ROOT / "CLAUDE.md"),
+    "codex": str(PROJECT_ROOT / ".codex" / "AGENTS.md"),
+    "gemini": str(PROJECT_ROOT / ".gemini" / "GEMINI.md"),
 }
 
 SESSION_HISTORY_HEADER = "## Session History"
 
 
-def parse_logs(since: str | None = None) -> list[dict]:
-    """Parse JSONL log file and return entries."""
-    if not LOG_FILE.exists():
-        return []
+def _parse_log_lines(data: bytes, entries: list[dict]) -> None:
+    """Append every valid JSON object in ``data`` (one per line) to ``entries``.
 
-    entries = []
-    since_dt = None
-    if since:
-        since_dt = datetime.fromisoformat(since).replace(tzinfo=timezone.utc)
+    Lines are handed to ``json.loads`` as raw bytes, which skips a separate
+    decode step; surrounding whitespace (including ``\\r``) is already
+    tolerated by the parser, so lines are not stripped first.
+    """
+    loads = json.loads
+    append = entries.append
+    for line in data.split(b"\n"):
+        if not line:
+            continue
+        try:
+            append(loads(line))
+        except ValueError:
+            continue
 
-    with open(LOG_FILE, encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                entry = json.loads(line)
-                if since_dt:
-                    entry_dt = datetime.fromisoformat(entry["timestamp"].replace("Z", "+00:00"))
-                    if entry_dt < since_dt:
-                        continue
-                entries.append(entry)
-            except (json.JSONDecodeError, KeyError):
-                continue
 
+def _read_log_entries() -> list[dict]:
+    """Parse every entry in LOG_FILE, or return [] if it cannot be read."""
+    try:
+        with open(LOG_FILE, "rb") as f:
+            data = f.read()
+    except OSError:
+        return []
+    entries: list[dict] = []
+    _parse_log_lines(data, entries)
     return entries
 
 
-def run_git_command(args: list[str]) -> str | None:
-    """Run a git command and return output, or None if failed."""
+def since_timestamp_key(since: str) -> str:
+    """Normalize a ``--since`` value to a string comparable with log timestamps.
+
+    The logger writes UTC ``isoformat()`` timestamps, which sort
+    lexicographically, so entries can be filtered with a plain string compare.
+    The offset-free key sorts before any timestamp for the same instant.
+    """
+    return datetime.fromisoformat(since).replace(tzinfo=None).isoformat()
+
+
+def parse_logs(since: str | None = None) -> list[dict]:
+    """Parse JSONL log file and return entries."""
+    if not since:
+        return _read_log_entries()
+
+    since_key = since_timestamp_key(since)
+    filtered = []
+    for entry in _read_log_entries():
+        timestamp = entry.get("timestamp")
+        if timestamp is not None and timestamp >= since_key:
+            filtered.append(entry)
+    return filtered
+
+
+def run_git_bytes(args: list[str], timeout: int = 30) -> bytes | None:
+    """Run a git command and return raw stdout, or None if failed."""
+    # Imported here: only the --full and --handoff modes touch git, so the
+    # session-history path never pays for subprocess
+    import subprocess
+
     try:
         result = subprocess.run(
             ["git", *args],
             cwd=PROJECT_ROOT,
-            capture_output=True,
-            text=True,
-            timeout=30,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            timeout=timeout,
         )
-        if result.returncode == 0:
-            return result.stdout.strip()
-        return None
     except (subprocess.TimeoutExpired, FileNotFoundError):
         return None
+    return result.stdout if result.returncode == 0 else None
+
+
+def run_git_command(args: list[str]) -> str | None:
+    """Run a git command and return stripped output, or None if failed."""
+    output = run_git_bytes(args)
+    if output is None:
+        return None
+    return output.decode("utf-8", errors="replace").strip()
+
+
+def run_git_line(args: list[str]) -> str | None:
+    """Run a quick single-line git query (e.g. rev-parse) with a short timeout."""
+    output = run_git_bytes(args, timeout=5)
+    if not output:
+        return None
+    return output.split(b"\n", 1)[0].decode("utf-8", errors="replace").strip() or None
+
+
+def run_git_lines(args: list[str], timeout: int = 30) -> list[str]:
+    """Run a git command and return its output lines, or [] if it failed.
+
+    Used for history walks. The timeout and exit status are enforced by
+    run_git_bytes, so a hung or failing git yields no lines, never partial ones.
+    """
+    output = run_git_bytes(args, timeout)
+    if output is None:
+        return []
+    return output.decode("utf-8", errors="replace").split("\n")
+
+
+def run_in_parallel(tasks: dict[str, Callable[[], Any]]) -> dict[str, Any]:
+    """Run independent git-backed tasks concurrently and return results per key.
+
+    Each task waits on its own git process, so total wall time is that of
+    the slowest command rather than the sum of all of them.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+        futures = {key: executor.submit(task) for key, task in tasks.items()}
+        return {key: future.result() for key, future in futures.items()}
 
 
-def get_git_commits(since: str | None = None) -> list[dict]:
-    """Get git commits since the specified date."""
+def git_commits_args(since: str | None = None) -> list[str]:
+    """Build git arguments for listing commits."""
     args = ["log", "--pretty=format:%H|%ai|%s", "-n", "100"]
     if since:
         args.extend(["--since", since])
+    return args
 
-    output = run_git_command(args)
-    if not output:
-        return []
 
+def file_history_args(since: str | None = None, *, with_stats: bool = True) -> list[str]:
+    """Build git arguments for file changes and, optionally, per-file line stats.
+
+    `--raw` carries the change status and `--numstat` the line counts, so one
+    git walk over the history yields both.
+    """
+    formats = ["--raw", "--numstat"] if with_stats else ["--raw"]
+    if since:
+        return ["log", "--since", since, *formats, "--pretty=format:"]
+    return ["diff", *formats, "HEAD~10", "HEAD"]
+
+
+WORKING_TREE_ARGS = ["status", "--short"]
+BRANCH_ARGS = ["rev-parse", "--abbrev-ref", "HEAD"]
+
+
+def parse_git_commits(lines: Iterable[str]) -> list[dict]:
+    """Parse `git log --pretty=format:%H|%ai|%s` output lines."""
     commits = []
-    for line in output.split("\n"):
+    for line in lines:
         if not line:
             continue
         parts = line.split("|", 2)
@@ -120,62 +209,39 @@ def get_git_commits(since: str | None = None) -> list[dict]:
     return commits
 
 
-def get_file_changes(since: str | None = None) -> dict[str, list[str]]:
-    """Get file changes (created, modified, deleted) since the specified date."""
-    changes: dict[str, list[str]] = {"created": [], "modified": [], "deleted": []}
+# First letter of a `--raw` status -> bucket in the file-changes summary.
+_STATUS_BUCKETS = {"A": "created", "M": "modified", "D": "deleted"}
 
-    if since:
-        args = ["log", "--since", since, "--name-status", "--pretty=format:"]
-    else:
-        args = ["diff", "--name-status", "HEAD~10", "HEAD"]
 
-    output = run_git_command(args)
-    if not output:
-        return changes
+def parse_file_history(
+    lines: Iterable[str],
+) -> tuple[dict[str, list[str]], dict[str, tuple[int, int]]]:
+    """Parse `--raw --numstat` output lines into file changes and line stats.
 
+    Raw lines (`:<modes> <hashes> <status>\t<path>`) give created/modified/
+    deleted files; numstat lines (`<added>\t<deleted>\t<path>`) give
+    per-file (added, deleted) totals.
+    """
+    changes: dict[str, list[str]] = {"created": [], "modified": [], "deleted": []}
+    stats: dict[str, tuple[int, int]] = {}
     seen: set[str] = set()
-    for line in output.split("\n"):
+    for line in lines:
         line = line.strip()
         if not line or "\t" not in line:
             continue
 
-        parts = line.split("\t", 1)
-        if len(parts) != 2:
-            continue
-
-        status, filepath = parts[0], parts[1]
-        if filepath in seen:
-            continue
-        seen.add(filepath)
-
-        if status.startswith("A"):
-            changes["created"].append(filepath)
-        elif status.startswith("M"):
-            changes["modified"].append(filepath)
-        elif status.startswith("D"):
-            changes["deleted"].append(filepath)
-
-    return changes
-
-
-def get_file_stats(since: str | None = None) -> dict[str, tuple[int, int]]:
-    """Get line additions/deletions per file."""
-    if since:
-        args = ["log", "--since", since, "--numstat", "--pretty=format:"]
-    else:
-        args = ["diff", "--numstat", "HEAD~10", "HEAD"]
-
-    output = run_git_command(args)
-    if not output:
-        return {}
+        if line.startswith(":"):
+            meta, _, filepath = line.partition("\t")
+            if filepath in seen:
+                continue
+            seen.add(filepath)
 
-    stats: dict[str, tuple[int, int]] = {}
-    for line in output.split("\n"):
-        line = line.strip()
-        if not line:
+            bucket = _STATUS_BUCKETS.get(meta.rpartition(" ")[2][:1])
+            if bucket is not None:
+                changes[bucket].append(filepath)
             continue
 
-        parts = line.split("\t")
+        parts = line.split("\t", 2)
         if len(parts) != 3:
             continue
 
@@ -191,17 +257,41 @@ def get_file_stats(since: str | None = None) -> dict[str, tuple[int, int]]:
         except ValueError:
             continue
 
-    return stats
+    return changes, stats
 
 
-def get_working_tree_changes() -> list[str]:
-    """Get git working tree changes in short format."""
-    output = run_git_command(["status", "--short"])
+def parse_working_tree_changes(output: str | None) -> list[str]:
+    """Parse `git status --short` output into non-empty lines."""
     if not output:
         return []
     return [line for line in output.split("\n") if line.strip()]
 
 
+def line_writer(stream: TextIO, copy_to: TextIO | None = None) -> Callable[[str], None]:
+    """Return an ``emit(line)`` that writes newline-separated lines to ``stream``.
+
+    Lines go straight to the (buffered) file instead of being collected and
+    joined, so the document is never held in memory as a second full copy.
+    As with ``"\\n".join``, no newline follows the last line. When ``copy_to``
+    is given, every write is mirrored to it as well.
+    """
+    if copy_to is None:
+        write = stream.write
+    else:
+        def write(text: str) -> None:
+            stream.write(text)
+            copy_to.write(text)
+    separator = ""
+
+    def emit(line: str) -> None:
+        nonlocal separator
+        write(separator)
+        write(line)
+        separator = "\n"
+
+    return emit
+
+
 def summarize_recent_entries(
     entries: list[dict],
     *,
@@ -215,10 +305,10 @@ def summarize_recent_entries(
             continue
         filtered.append(entry)
 
-    recent = sorted(filtered, key=lambda e: e.get("timestamp", ""), reverse=True)
+    recent = heapq.nlargest(limit, filtered, key=lambda e: e.get("timestamp", ""))
 
     summaries: list[str] = []
-    for entry in recent[:limit]:
+    for entry in recent:
         tool = entry.get("tool", "unknown")
         prompt = entry.get("prompt", "")
         prompt_summary = prompt.replace("\n", " ").strip()
@@ -231,28 +321,66 @@ def summarize_recent_entries(
     return summaries
 
 
+def write_resume_prompt(prompt_file: Path, handoff_name: str, goal: str | None) -> None:
+    """Write the resume prompt that points the next session at a handoff file."""
+    with open(prompt_file, "w", encoding="utf-8", buffering=1 << 16) as out:
+        emit = line_writer(out)
+        emit("# Resume Prompt")
+        emit("")
+        emit("Copy the following block into the first message of your next session:")
+        emit("")
+        emit("```text")
+        emit("このプロジェクトの作業を再開します。まず handoff を読んで状況整理してください。")
+        emit(f"- Handoff file: `.claude/handoffs/{handoff_name}`")
+        emit(f"- Goal: {goal if goal else '(No explicit goal provided)'}")
+        emit("")
+        emit("進め方:")
+        emit("1. Snapshot / Open Work / Suggested Next Actions を要約")
+        emit("2. 最初の1手を提案し、承認後に実行")
+        emit("3. 変更後に Verification Checklist のコマンドを実行")
+        emit("4. 終了前に `/handoff` を更新")
+        emit("```")
+
+
 def generate_handoff_package(since: str | None = None, goal: str | None = None) -> tuple[Path, Path]:
     """Generate handoff summary + resume prompt for the next session."""
-    timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%d-%H%M%S")
+    now = datetime.now(timezone.utc)
+    timestamp = now.strftime("%Y-%m-%d-%H%M%S")
     HANDOFFS_DIR.mkdir(parents=True, exist_ok=True)
 
     handoff_file = HANDOFFS_DIR / f"{timestamp}.md"
     prompt_file = HANDOFFS_DIR / f"{timestamp}.prompt.md"
 
     entries = parse_logs(since)
-    commits = get_git_commits(since)
-    file_changes = get_file_changes(since)
-    working_tree = get_working_tree_changes()
-    branch = run_git_command(["rev-parse", "--abbrev-ref", "HEAD"]) or "unknown"
-
-    codex_entries = [e for e in entries if e.get("tool") == "codex"]
-    gemini_entries = [e for e in entries if e.get("tool") == "gemini"]
-
-    codex_success = sum(1 for e in codex_entries if e.get("success", False))
-    gemini_success = sum(1 for e in gemini_entries if e.get("success", False))
-
-    recent_successes = summarize_recent_entries(entries, success=True, limit=5)
-    recent_failures = summarize_recent_entries(entries, success=False, limit=5)
+    git_results = run_in_parallel({
+        "commits": lambda: parse_git_commits(run_git_lines(git_commits_args(since))),
+        "history": lambda: parse_file_history(
+            run_git_lines(file_history_args(since, with_stats=False))
+        ),
+        "working_tree": lambda: parse_working_tree_changes(run_git_command(WORKING_TREE_ARGS)),
+        "branch": lambda: run_git_line(BRANCH_ARGS),
+    })
+    commits = git_results["commits"]
+    file_changes, _ = git_results["history"]
+    working_tree = git_results["working_tree"]
+    branch = git_results["branch"] or "unknown"
+
+    # One pass for per-tool totals and the success/failure split.
+    tool_counts = {"codex": [0, 0], "gemini": [0, 0]}  # [total, succeeded]
+    successful: list[dict] = []
+    failed: list[dict] = []
+    for entry in entries:
+        ok = entry.get("success", False)
+        counts = tool_counts.get(entry.get("tool"))
+        if counts is not None:
+            counts[0] += 1
+            counts[1] += bool(ok)
+        (successful if ok else failed).append(entry)
+    codex_total, codex_success = tool_counts["codex"]
+    gemini_total, gemini_success = tool_counts["gemini"]
+
+    recent_successes = summarize_recent_entries(successful, success=None, limit=5)
+    recent_failures = summarize_recent_entries(failed, success=None, limit=5)
 
     total_files = (
         len(file_changes["created"])
@@ -280,126 +408,109 @@ def generate_handoff_package(since: str | None = None, goal: str | None = None)
         deduped_actions.append(action)
         seen_actions.add(action)
 
-    handoff_lines: list[str] = []
-    handoff_lines.append(f"# Handoff: {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')} UTC")
-    handoff_lines.append("")
-    handoff_lines.append("## Goal")
-    handoff_lines.append("")
-    handoff_lines.append(f"- {goal if goal else '(No explicit goal provided)'}")
-    handoff_lines.append("")
-
-    handoff_lines.append("## Snapshot")
-    handoff_lines.append("")
-    handoff_lines.append(f"- **Branch**: `{branch}`")
-    handoff_lines.append(f"- **Commits captured**: {len(commits)}")
-    handoff_lines.append(
-        f"- **Files changed (git history window)**: {total_files} "
-        f"({len(file_changes['modified'])} modified, "
-        f"{len(file_changes['created'])} created, "
-        f"{len(file_changes['deleted'])} deleted)"
-    )
-    handoff_lines.append(f"- **Working tree changes**: {len(working_tree)}")
-    handoff_lines.append(
-        f"- **Codex consultations**: {len(codex_entries)} "
-        f"({codex_success} success, {len(codex_entries) - codex_success} failed)"
-    )
-    handoff_lines.append(
-        f"- **Gemini researches**: {len(gemini_entries)} "
-        f"({gemini_success} success, {len(gemini_entries) - gemini_success} failed)"
-    )
-    if since:
-        handoff_lines.append(f"- **Since**: {since}")
-    handoff_lines.append("")
-
-    handoff_lines.append("## Completed Signals")
-    handoff_lines.append("")
-    if recent_successes:
-        for item in recent_successes:
-            handoff_lines.append(f"- {item}")
-    else:
-        handoff_lines.append("- No successful CLI consultations recorded in the selected range.")
-    handoff_lines.append("")
-
-    handoff_lines.append("## Open Work")
-    handoff_lines.append("")
-    handoff_lines.append("### Working Tree Changes")
-    handoff_lines.append("")
-    if working_tree:
-        for line in working_tree[:20]:
-            handoff_lines.append(f"- `{line}`")
-        if len(working_tree) > 20:
-            handoff_lines.append(f"- ... and {len(working_tree) - 20} more")
-    else:
-        handoff_lines.append("- Working tree is clean.")
-    handoff_lines.append("")
-
-    handoff_lines.append("### Recent Failed CLI Calls")
-    handoff_lines.append("")
-    if recent_failures:
-        for item in recent_failures:
-            handoff_lines.append(f"- {item}")
-    else:
-        handoff_lines.append("- No failed CLI calls recorded in the selected range.")
-    handoff_lines.append("")
-
-    handoff_lines.append("## Suggested Next Actions")
-    handoff_lines.append("")
-    for index, action in enumerate(deduped_actions[:4], start=1):
-        handoff_lines.append(f"{index}. {action}")
-    handoff_lines.append("")
-
-    handoff_lines.append("## Verification Checklist")
-    handoff_lines.append("")
-    handoff_lines.append("- `git status --short`")
-    handoff_lines.append("- `poe lint` (or project-specific lint command)")
-    handoff_lines.append("- `poe test` (or focused test command)")
-    handoff_lines.append("")
-
-    handoff_lines.append("## Resume Prompt")
-    handoff_lines.append("")
-    handoff_lines.append(f"Use `{prompt_file.name}` in the next session.")
-    handoff_lines.append("")
-    handoff_lines.append("---")
-    handoff_lines.append(f"*Generated by checkpointing skill at {timestamp}*")
-
-    handoff_file.write_text("\n".join(handoff_lines), encoding="utf-8")
-
-    resume_prompt_lines: list[str] = []
-    resume_prompt_lines.append("# Resume Prompt")
-    resume_prompt_lines.append("")
-    resume_prompt_lines.append("Copy the following block into the first message of your next session:")
-    resume_prompt_lines.append("")
-    resume_prompt_lines.append("```text")
-    resume_prompt_lines.append("このプロジェクトの作業を再開します。まず handoff を読んで状況整理してください。")
-    resume_prompt_lines.append(f"- Handoff file: `.claude/handoffs/{handoff_file.name}`")
-    resume_prompt_lines.append(f"- Goal: {goal if goal else '(No explicit goal provided)'}")
-    resume_prompt_lines.append("")
-    resume_prompt_lines.append("進め方:")
-    resume_prompt_lines.append("1. Snapshot / Open Work / Suggested Next Actions を要約")
-    resume_prompt_lines.append("2. 最初の1手を提案し、承認後に実行")
-    resume_prompt_lines.append("3. 変更後に Verification Checklist のコマンドを実行")
-    resume_prompt_lines.append("4. 終了前に `/handoff` を更新")
-    resume_prompt_lines.append("```")
-
-    prompt_file.write_text("\n".join(resume_prompt_lines), encoding="utf-8")
+    # The resume prompt only needs the handoff file name, so it is written
+    # on a worker thread while the handoff itself is written here.
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        prompt_written = executor.submit(write_resume_prompt, prompt_file, handoff_file.name, goal)
+        with open(handoff_file, "w", encoding="utf-8", buffering=1 << 16) as out:
+            emit = line_writer(out)
+            emit(f"# Handoff: {now:%Y-%m-%d %H:%M:%S} UTC")
+            emit("")
+            emit("## Goal")
+            emit("")
+            emit(f"- {goal if goal else '(No explicit goal provided)'}")
+            emit("")
+
+            emit("## Snapshot")
+            emit("")
+            emit(f"- **Branch**: `{branch}`")
+            emit(f"- **Commits captured**: {len(commits)}")
+            emit(
+                f"- **Files changed (git history window)**: {total_files} "
+                f"({len(file_changes['modified'])} modified, "
+                f"{len(file_changes['created'])} created, "
+                f"{len(file_changes['deleted'])} deleted)"
+            )
+            emit(f"- **Working tree changes**: {len(working_tree)}")
+            emit(
+                f"- **Codex consultations**: {codex_total} "
+                f"({codex_success} success, {codex_total - codex_success} failed)"
+            )
+            emit(
+                f"- **Gemini researches**: {gemini_total} "
+                f"({gemini_success} success, {gemini_total - gemini_success} failed)"
+            )
+            if since:
+                emit(f"- **Since**: {since}")
+            emit("")
+
+            emit("## Completed Signals")
+            emit("")
+            if recent_successes:
+                for item in recent_successes:
+                    emit(f"- {item}")
+            else:
+                emit("- No successful CLI consultations recorded in the selected range.")
+            emit("")
+
+            emit("## Open Work")
+            emit("")
+            emit("### Working Tree Changes")
+            emit("")
+            if working_tree:
+                for line in working_tree[:20]:
+                    emit(f"- `{line}`")
+                if len(working_tree) > 20:
+                    emit(f"- ... and {len(working_tree) - 20} more")
+            else:
+                emit("- Working tree is clean.")
+            emit("")
+
+            emit("### Recent Failed CLI Calls")
+            emit("")
+            if recent_failures:
+                for item in recent_failures:
+                    emit(f"- {item}")
+            else:
+                emit("- No failed CLI calls recorded in the selected range.")
+            emit("")
+
+            emit("## Suggested Next Actions")
+            emit("")
+            for index, action in enumerate(deduped_actions[:4], start=1):
+                emit(f"{index}. {action}")
+            emit("")
+
+            emit("## Verification Checklist")
+            emit("")
+            emit("- `git status --short`")
+            emit("- `poe lint` (or project-specific lint command)")
+            emit("- `poe test` (or focused test command)")
+            emit("")
+
+            emit("## Resume Prompt")
+            emit("")
+            emit(f"Use `{prompt_file.name}` in the next session.")
+            emit("")
+            emit("---")
+            emit(f"*Generated by checkpointing skill at {timestamp}*")
+        prompt_written.result()
 
     return handoff_file, prompt_file
 
 
 def summarize_entries(entries: list[dict]) -> dict[str, list[dict]]:
     """Group and summarize entries by tool and date."""
-    by_date: dict[str, dict[str, list]] = {}
+    by_date: defaultdict[str, dict[str, list]] = defaultdict(lambda: {"codex": [], "gemini": []})
 
     for entry in entries:
         ts = entry.get("timestamp", "")
-        date = ts[:10] if ts else "unknown"
-        tool = entry.get("tool", "unknown")
-
-        if date not in by_date:
-            by_date[date] = {"codex": [], "gemini": []}
-
-        if tool in by_date[date]:
-            by_date[date][tool].append({
+        # Every dated entry creates its day bucket, even for untracked tools.
+        bucket = by_date[ts[:10] if ts else "unknown"].get(entry.get("tool", "unknown"))
+        if bucket is not None:
+            bucket.append({
                 "prompt": entry.get("prompt", "")[:200],
                 "response_preview": entry.get("response", "")[:300],
                 "success": entry.get("success", False),
@@ -440,29 +551,40 @@ def generate_session_history(by_date: dict) -> str:
     return "\n".join(lines)
 
 
-def update_context_file(file_path: Path, session_history: str) -> bool:
+def update_context_file(file_path: str, session_history: str) -> bool:
     """Update context file with session history."""
-    if not file_path.exists():
+    try:
+        with open(file_path, encoding="utf-8") as f:
+            content = f.read()
+    except FileNotFoundError:
         print(f"Warning: {file_path} does not exist, skipping")
         return False
 
-    content = file_path.read_text(encoding="utf-8")
-
-    # Remove existing session history section
-    pattern = rf"{re.escape(SESSION_HISTORY_HEADER)}.*"
-    content = re.sub(pattern, "", content, flags=re.DOTALL)
+    # Remove existing session history section (it always runs to end of file)
+    header_at = content.find(SESSION_HISTORY_HEADER)
+    if header_at != -1:
+        content = content[:header_at]
     content = content.rstrip() + "\n\n"
 
     # Append new session history
     content += session_history
 
-    file_path.write_text(content, encoding="utf-8")
+    with open(file_path, "w", encoding="utf-8") as f:
+        f.write(content)
     return True
 
 
-def generate_full_checkpoint(since: str | None = None) -> Path | None:
-    """Generate a comprehensive checkpoint file."""
-    timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%d-%H%M%S")
+def generate_full_checkpoint(
+    since: str | None = None,
+    copy_to: TextIO | None = None,
+) -> Path | None:
+    """Generate a comprehensive checkpoint file.
+
+    If ``copy_to`` is given, the checkpoint content is also written to it,
+    so callers that need the text do not have to read the file back.
+    """
+    now = datetime.now(timezone.utc)
+    timestamp = now.strftime("%Y-%m-%d-%H%M%S")
     checkpoint_file = CHECKPOINTS_DIR / f"{timestamp}.md"
 
     # Ensure checkpoints directory exists
@@ -470,128 +592,131 @@ def generate_full_checkpoint(since: str | None = None) -> Path | None:
 
     # Gather data
     entries = parse_logs(since)
-    commits = get_git_commits(since)
-    file_changes = get_file_changes(since)
-    file_stats = get_file_stats(since)
-
-    # Count CLI consultations
-    codex_count = sum(1 for e in entries if e.get("tool") == "codex")
-    gemini_count = sum(1 for e in entries if e.get("tool") == "gemini")
+    git_results = run_in_parallel({
+        "commits": lambda: parse_git_commits(run_git_lines(git_commits_args(since))),
+        "history": lambda: parse_file_history(run_git_lines(file_history_args(since))),
+    })
+    commits = git_results["commits"]
+    file_changes, file_stats = git_results["history"]
+
+    # Split CLI consultations by tool in one pass
+    entries_by_tool: dict[str, list[dict]] = {"codex": [], "gemini": []}
+    for entry in entries:
+        bucket = entries_by_tool.get(entry.get("tool"))
+        if bucket is not None:
+            bucket.append(entry)
+    codex_entries = entries_by_tool["codex"]
+    gemini_entries = entries_by_tool["gemini"]
 
     # Build checkpoint content
-    lines: list[str] = []
-
-    # Header
-    lines.append(f"# Checkpoint: {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')} UTC")
-    lines.append("")
-
-    # Summary
-    lines.append("## Summary")
-    lines.append("")
-    total_files = (
-        len(file_changes["created"])
-        + len(file_changes["modified"])
-        + len(file_changes["deleted"])
-    )
-    lines.append(f"- **Commits**: {len(commits)}")
-    lines.append(
-        f"- **Files changed**: {total_files} "
-        f"({len(file_changes['modified'])} modified, "
-        f"{len(file_changes['created'])} created, "
-        f"{len(file_changes['deleted'])} deleted)"
-    )
-    lines.append(f"- **Codex consultations**: {codex_count}")
-    lines.append(f"- **Gemini researches**: {gemini_count}")
-    if since:
-        lines.append(f"- **Since**: {since}")
-    lines.append("")
-
-    # Git History
-    lines.append("## Git History")
-    lines.append("")
-
-    if commits:
-        lines.append("### Commits")
-        lines.append("")
-        for commit in commits[:20]:  # Limit to 20 commits
-            lines.append(f"- `{commit['hash']}` {commit['message']}")
-        if len(commits) > 20:
-            lines.append(f"- ... and {len(commits) - 20} more commits")
-        lines.append("")
-
-    # File Changes
-    lines.append("### File Changes")
-    lines.append("")
-
-    if file_changes["created"]:
-        lines.append("**Created:**")
-        for f in file_changes["created"][:15]:
-            stat = file_stats.get(f, (0, 0))
-            lines.append(f"- `{f}` (+{stat[0]})")
-        if len(file_changes["created"]) > 15:
-            lines.append(f"- ... and {len(file_changes['created']) - 15} more files")
-        lines.append("")
-
-    if file_changes["modified"]:
-        lines.append("**Modified:**")
-        for f in file_changes["modified"][:15]:
-            stat = file_stats.get(f, (0, 0))
-            lines.append(f"- `{f}` (+{stat[0]}, -{stat[1]})")
-        if len(file_changes["modified"]) > 15:
-            lines.append(f"- ... and {len(file_changes['modified']) - 15} more files")
-        lines.append("")
-
-    if file_changes["deleted"]:
-        lines.append("**Deleted:**")
-        for f in file_changes["deleted"][:15]:
-            lines.append(f"- `{f}`")
-        if len(file_changes["deleted"]) > 15:
-            lines.append(f"- ... and {len(file_changes['deleted']) - 15} more files")
-        lines.append("")
-
-    if not any(file_changes.values()):
-        lines.append("No file changes detected.")
-        lines.append("")
-
-    # CLI Tool Consultations
-    lines.append("## CLI Tool Consultations")
-    lines.append("")
-
-    codex_entries = [e for e in entries if e.get("tool") == "codex"]
-    gemini_entries = [e for e in entries if e.get("tool") == "gemini"]
-
-    if codex_entries:
-        lines.append(f"### Codex ({len(codex_entries)} consultations)")
-        lines.append("")
-        for entry in codex_entries[:10]:
-            status = "✓" if entry.get("success", False) else "✗"
-            prompt = entry.get("prompt", "")[:80].replace("\n", " ")
-            lines.append(f"- {status} {prompt}...")
-        if len(codex_entries) > 10:
-            lines.append(f"- ... and {len(codex_entries) - 10} more consultations")
-        lines.append("")
-
-    if gemini_entries:
-        lines.append(f"### Gemini ({len(gemini_entries)} researches)")
-        lines.append("")
-        for entry in gemini_entries[:10]:
-            status = "✓" if entry.get("success", False) else "✗"
-            prompt = entry.get("prompt", "")[:80].replace("\n", " ")
-            lines.append(f"- {status} {prompt}...")
-        if len(gemini_entries) > 10:
-            lines.append(f"- ... and {len(gemini_entries) - 10} more researches")
-        lines.append("")
-
-    if not entries:
-        lines.append("No CLI tool consultations recorded.")
-        lines.append("")
-
-    # Footer
-    lines.append("---")
-    lines.append(f"*Generated by checkpointing skill at {timestamp}*")
-
-    # Write checkpoint file
-    checkpoint_file.write_text("\n".join(lines), encoding="utf-8")
+    with open(checkpoint_file, "w", encoding="utf-8", buffering=1 << 16) as out:
+        emit = line_writer(out, copy_to)
+
+        # Header
+        emit(f"# Checkpoint: {now:%Y-%m-%d %H:%M:%S} UTC")
+        emit("")
+
+        # Summary
+        emit("## Summary")
+        emit("")
+        total_files = (
+            len(file_changes["created"])
+            + len(file_changes["modified"])
+            + len(file_changes["deleted"])
+        )
+        emit(f"- **Commits**: {len(commits)}")
+        emit(
+            f"- **Files changed**: {total_files} "
+            f"({len(file_changes['modified'])} modified, "
+            f"{len(file_changes['created'])} created, "
+            f"{len(file_changes['deleted'])} deleted)"
+        )
+        emit(f"- **Codex consultations**: {len(codex_entries)}")
+        emit(f"- **Gemini researches**: {len(gemini_entries)}")
+        if since:
+            emit(f"- **Since**: {since}")
+        emit("")
+
+        # Git History
+        emit("## Git History")
+        emit("")
+
+        if commits:
+            emit("### Commits")
+            emit("")
+            for commit in commits[:20]:  # Limit to 20 commits
+                emit(f"- `{commit['hash']}` {commit['message']}")
+            if len(commits) > 20:
+                emit(f"- ... and {len(commits) - 20} more commits")
+            emit("")
+
+        # File Changes
+        emit("### File Changes")
+        emit("")
+
+        if file_changes["created"]:
+            emit("**Created:**")
+            for f in file_changes["created"][:15]:
+                stat = file_stats.get(f, (0, 0))
+                emit(f"- `{f}` (+{stat[0]})")
+            if len(file_changes["created"]) > 15:
+                emit(f"- ... and {len(file_changes['created']) - 15} more files")
+            emit("")
+
+        if file_changes["modified"]:
+            emit("**Modified:**")
+            for f in file_changes["modified"][:15]:
+                stat = file_stats.get(f, (0, 0))
+                emit(f"- `{f}` (+{stat[0]}, -{stat[1]})")
+            if len(file_changes["modified"]) > 15:
+                emit(f"- ... and {len(file_changes['modified']) - 15} more files")
+            emit("")
+
+        if file_changes["deleted"]:
+            emit("**Deleted:**")
+            for f in file_changes["deleted"][:15]:
+                emit(f"- `{f}`")
+            if len(file_changes["deleted"]) > 15:
+                emit(f"- ... and {len(file_changes['deleted']) - 15} more files")
+            emit("")
+
+        if not any(file_changes.values()):
+            emit("No file changes detected.")
+            emit("")
+
+        # CLI Tool Consultations
+        emit("## CLI Tool Consultations")
+        emit("")
+
+        if codex_entries:
+            emit(f"### Codex ({len(codex_entries)} consultations)")
+            emit("")
+            for entry in codex_entries[:10]:
+                status = "✓" if entry.get("success", False) else "✗"
+                prompt = entry.get("prompt", "")[:80].replace("\n", " ")
+                emit(f"- {status} {prompt}...")
+            if len(codex_entries) > 10:
+                emit(f"- ... and {len(codex_entries) - 10} more consultations")
+            emit("")
+
+        if gemini_entries:
+            emit(f"### Gemini ({len(gemini_entries)} researches)")
+            emit("")
+            for entry in gemini_entries[:10]:
+                status = "✓" if entry.get("success", False) else "✗"
+                prompt = entry.get("prompt", "")[:80].replace("\n", " ")
+                emit(f"- {status} {prompt}...")
+            if len(gemini_entries) > 10:
+                emit(f"- ... and {len(gemini_entries) - 10} more researches")
+            emit("")
+
+        if not entries:
+            emit("No CLI tool consultations recorded.")
+            emit("")
+
+        # Footer
+        emit("---")
+        emit(f"*Generated by checkpointing skill at {timestamp}*")
 
     return checkpoint_file
 
@@ -705,6 +830,9 @@ def resume_handoff(index: int = 0) -> str | None:
 
 
 def main():
+    # Imported here so code importing this module for its helpers skips argparse
+    import argparse
+
     parser = argparse.ArgumentParser(
         description="Checkpoint session context",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -807,7 +935,8 @@ Examples:
     if args.full:
         # Full checkpoint mode
         print("Creating full checkpoint...")
-        checkpoint_file = generate_full_checkpoint(args.since)
+        content_copy = io.StringIO() if args.analyze else None
+        checkpoint_file = generate_full_checkpoint(args.since, content_copy)
         if checkpoint_file:
             print(f"\nCheckpoint created: {checkpoint_file}")
             print("\nCheckpoint includes:")
@@ -817,8 +946,7 @@ Examples:
 
             if args.analyze:
                 # Generate skill analysis prompt
-                checkpoint_content = checkpoint_file.read_text(encoding="utf-8")
-                prompt = generate_skill_analysis_prompt(checkpoint_content)
+                prompt = generate_skill_analysis_prompt(content_copy.getvalue())
 
                 # Save prompt to file
                 prompt_file = checkpoint_file.with_suffix(".analyze-prompt.md")
@@ -2,24 +2,77 @@
 """Self-diagnosis script for Claude Code Orchestra template."""
 
 import argparse
+import functools
 import json
-import py_compile
-import shutil
+import os
+import stat
 import sys
 from pathlib import Path
 
 
+@functools.cache
 def find_project_root(start: Path) -> Path | None:
-    """Walk up from *start* looking for CLAUDE.md."""
-    current = start.resolve()
-    for parent in [current, *current.parents]:
-        if (parent / "CLAUDE.md").exists():
-            return parent
+    """Walk up from *start* looking for CLAUDE.md.
+
+    The lexical absolute path is tried first; resolve() and its per-component
+    symlink walk are only paid for if that finds nothing.
+    """
+    current = Path(os.path.abspath(start))
+    root = find_claude_md_upwards(current)
+    if root is None:
+        resolved = current.resolve()
+        if resolved != current:
+            root = find_claude_md_upwards(resolved)
+    return root
+
+
+def find_claude_md_upwards(current: Path) -> Path | None:
+    """Return the nearest of *current* and its parents that contains CLAUDE.md."""
+    for parent in (current, *current.parents):
+        try:
+            os.lstat(parent / "CLAUDE.md")
+        except OSError:
+            continue
+        return parent
     return None
 
 
-def check_tool(name: str, verbose: bool) -> bool:
-    path = shutil.which(name)
+def build_tool_index(names: list[str]) -> dict[str, str]:
+    """Locate *names* on PATH with one directory listing per PATH entry.
+
+    Like shutil.which, the first executable match in PATH order wins, but
+    each directory is read once for all tools instead of stat'ed per tool.
+    On Windows, names also match with any PATHEXT extension.
+    """
+    wanted = {name.lower() if sys.platform == "win32" else name for name in names}
+    pathext: set[str] = set()
+    if sys.platform == "win32":
+        pathext = {ext.lower() for ext in os.environ.get("PATHEXT", "").split(os.pathsep) if ext}
+
+    index: dict[str, str] = {}
+    for directory in os.environ.get("PATH", os.defpath).split(os.pathsep):
+        if not directory:
+            continue
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if pathext:
+                        name = name.lower()
+                        stem, ext = os.path.splitext(name)
+                        if ext in pathext:
+                            name = stem
+                    if name not in wanted or name in index:
+                        continue
+                    if entry.is_file() and os.access(entry.path, os.X_OK):
+                        index[name] = entry.path
+        except OSError:
+            continue
+    return index
+
+
+def check_tool(name: str, verbose: bool, tool_index: dict[str, str]) -> bool:
+    path = tool_index.get(name.lower() if sys.platform == "win32" else name)
     if path:
         if verbose:
             print(f"  found: {path}")
@@ -27,52 +80,89 @@ def check_tool(name: str, verbose: bool) -> bool:
     return False
 
 
+# Directory listings keyed by parent, so sibling checks share one scandir.
+_scan_cache: dict[Path, dict[str, os.DirEntry]] = {}
+
+
+def scan_dir(directory: Path) -> dict[str, os.DirEntry]:
+    """Return *directory*'s entries by name, listing it at most once."""
+    entries = _scan_cache.get(directory)
+    if entries is None:
+        try:
+            with os.scandir(directory) as it:
+                entries = {entry.name: entry for entry in it}
+        except OSError:
+            entries = {}
+        _scan_cache[directory] = entries
+    return entries
+
+
 def check_directory(root: Path, rel: str) -> bool:
-    return (root / rel).is_dir()
+    path = root / rel
+    entry = scan_dir(path.parent).get(path.name)
+    return entry is not None and entry.is_dir()
 
 
 def check_settings_json(root: Path, verbose: bool) -> bool:
     settings = root / ".claude" / "settings.json"
-    if not settings.exists():
+    try:
+        # json.loads takes the raw bytes and detects UTF-8 itself
+        json.loads(settings.read_bytes())
+        return True
+    except FileNotFoundError:
         if verbose:
             print("  settings.json not found (optional)")
         return True
-    try:
-        json.loads(settings.read_text(encoding="utf-8"))
-        return True
-    except (json.JSONDecodeError, OSError) as e:
+    except (ValueError, OSError) as e:
         if verbose:
             print(f"  error: {e}")
         return False
 
 
+def compile_hook(py_file: Path) -> str | None:
+    """Compile one hook in memory, returning an error line or None on success.
+
+    Only a syntax check is needed, so the code object is discarded rather
+    than written to __pycache__.
+    """
+    try:
+        compile(py_file.read_bytes(), str(py_file), "exec")
+    except (SyntaxError, ValueError, OSError) as e:
+        return f"{py_file.name}: {e}"
+    return None
+
+
 def check_hooks_compile(root: Path, verbose: bool) -> list[str]:
-    hooks_dir = root / ".claude" / "hooks"
-    failures: list[str] = []
-    if not hooks_dir.is_dir():
-        return failures
-    for py_file in sorted(hooks_dir.glob("*.py")):
-        try:
-            py_compile.compile(str(py_file), doraise=True)
-        except py_compile.PyCompileError as e:
-            failures.append(f"{py_file.name}: {e}")
-            if verbose:
-                print(f"  FAIL: {py_file.name}: {e}")
+    if not check_directory(root, ".claude/hooks"):
+        return []
+    hook_entries = scan_dir(root / ".claude" / "hooks")
+    results = [
+        compile_hook(Path(entry.path))
+        for name, entry in sorted(hook_entries.items())
+        if name.endswith(".py") and entry.is_file()
+    ]
+    failures = [error for error in results if error is not None]
+    if verbose:
+        for error in failures:
+            print(f"  FAIL: {error}")
     return failures
 
 
 def check_symlink(root: Path, rel: str, verbose: bool) -> bool | None:
     target = root / rel
-    if not target.exists() and not target.is_symlink():
+    # No other check lists this parent, so one lstat beats a cached scandir
+    try:
+        st = os.lstat(target)
+    except OSError:
         return None
-    if target.is_symlink():
-        resolved = target.resolve()
-        ok = resolved.exists()
-        if verbose:
-            status = "valid" if ok else "BROKEN"
-            print(f"  {rel} -> {resolved} ({status})")
-        return ok
-    return True
+    if not stat.S_ISLNK(st.st_mode):
+        return True
+    ok = os.path.exists(target)
+    if verbose:
+        resolved = os.path.normpath(target.parent / os.readlink(target))
+        status = "valid" if ok else "BROKEN"
+        print(f"  {rel} -> {resolved} ({status})")
+    return ok
 
 
 def main() -> int:
@@ -80,6 +170,11 @@ def main() -> int:
     parser.add_argument("--verbose", "-v", action="store_true")
     args = parser.parse_args()
 
+    # The report is short; on a terminal, emit it as one write at exit instead
+    # of flushing every line. Helpers keep using print(), so ordering is intact.
+    if getattr(sys.stdout, "line_buffering", False):
+        sys.stdout.reconfigure(line_buffering=False)
+
     root = find_project_root(Path(__file__).parent)
     if root is None:
         print("✗ Could not find project root (no CLAUDE.md found)")
@@ -91,9 +186,10 @@ def main() -> int:
     all_ok = True
 
     tools = ["python", "uv", "ruff", "ty", "codex", "gemini"]
+    tool_index = build_tool_index(tools)
     print("=== Tool Availability ===")
     for tool in tools:
-        ok = check_tool(tool, args.verbose)
+        ok = check_tool(tool, args.verbose, tool_index)
         mark = "✓" if ok else "✗"
         print(f"  {mark} {tool}")
         if not ok:
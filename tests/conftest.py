@@ -0,0 +1,18 @@
+"""Shared pytest configuration for the hook tests."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+HOOKS_DIR = Path(__file__).resolve().parent.parent / ".claude" / "hooks"
+# Listed once per session; every test taking a ``hook`` argument runs per hook.
+with os.scandir(HOOKS_DIR) as _entries:
+    ALL_HOOKS = sorted(
+        Path(entry.path) for entry in _entries if entry.name.endswith(".py") and entry.is_file()
+    )
+
+
+def pytest_generate_tests(metafunc: pytest.Metafunc) -> None:
+    if "hook" in metafunc.fixturenames:
+        metafunc.parametrize("hook", ALL_HOOKS, ids=[h.name for h in ALL_HOOKS])